@@ -1,30 +1,23 @@
 import csv
-from sim import run_sim
+
+from sim import run_sim_grid
 
 cache_sizes = [20, 50, 100, 200]
 policies = ["LRU", "LFU", "FIFO", "RANDOM", "NOCACHE"]
 
-with open("results/cache_size_results.csv", "w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(["cache_size", "policy", "hit_ratio", "avg_latency", "p95_latency", "origin_load"])
+
+if __name__ == "__main__":
+    rows = []
+    param_list = []
 
     for C in cache_sizes:
         for pol in policies:
             if pol == "NOCACHE":
                 C = 0   # override capacity
                 # no eviction, no insert
-                metrics = run_sim(
-                    n_contents=1000,
-                    n_edges=4,
-                    capacity=0,
-                    alpha=1.0,
-                    policy="LRU",
-                    n_requests=200_000,
-                    lat_edge_ms=10,
-                    lat_origin_ms=100,
-                    seed=42
-                )
-            metrics = run_sim(
+
+            rows.append((C, pol))
+            param_list.append(dict(
                 n_contents=1000,
                 n_edges=4,
                 capacity=C,
@@ -34,8 +27,15 @@ with open("results/cache_size_results.csv", "w", newline="") as f:
                 lat_edge_ms=10,
                 lat_origin_ms=100,
                 seed=42
-            )
+            ))
+
+    results = run_sim_grid(param_list)
+
+    with open("results/cache_size_results.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["cache_size", "policy", "hit_ratio", "avg_latency", "p95_latency", "origin_load"])
 
+        for (C, pol), metrics in zip(rows, results):
             writer.writerow([
                 C,
                 pol,
@@ -45,4 +45,4 @@ with open("results/cache_size_results.csv", "w", newline="") as f:
                 metrics["origin_load"]
             ])
 
-print("Cache size experiment complete!")
+    print("Cache size experiment complete!")
@@ -1,12 +1,14 @@
 import csv
-from sim import run_sim
+
+from sim import run_sim_grid
 
 edge_counts = [1, 2, 4, 8]
 policies = ["NOCACHE", "LRU", "LFU", "FIFO", "RANDOM"]
 
-with open("results/edge_count_results.csv", "w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(["n_edges", "policy", "hit_ratio", "avg_latency", "p95_latency", "origin_load"])
+
+if __name__ == "__main__":
+    rows = []
+    param_list = []
 
     for k in edge_counts:
         for pol in policies:
@@ -14,7 +16,8 @@ with open("results/edge_count_results.csv", "w", newline="") as f:
             # NoCache = capacity 0
             C = 0 if pol == "NOCACHE" else 100
 
-            metrics = run_sim(
+            rows.append((k, pol))
+            param_list.append(dict(
                 n_contents=1000,
                 n_edges=k,
                 capacity=C,
@@ -24,8 +27,15 @@ with open("results/edge_count_results.csv", "w", newline="") as f:
                 lat_edge_ms=10,
                 lat_origin_ms=100,
                 seed=42
-            )
+            ))
+
+    results = run_sim_grid(param_list)
+
+    with open("results/edge_count_results.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["n_edges", "policy", "hit_ratio", "avg_latency", "p95_latency", "origin_load"])
 
+        for (k, pol), metrics in zip(rows, results):
             writer.writerow([
                 k,
                 pol,
@@ -35,4 +45,4 @@ with open("results/edge_count_results.csv", "w", newline="") as f:
                 metrics["origin_load"]
             ])
 
-print("Edge count experiment complete!")
+    print("Edge count experiment complete!")
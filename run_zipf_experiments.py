@@ -1,40 +1,52 @@
 import csv
-from sim import run_sim
+
+from sim import run_sim_grid
 
 alphas = [0.6, 0.8, 1.0, 1.2]
 policies = ["LRU", "LFU", "FIFO", "RANDOM", "NOCACHE"]
 
-with open("results/zipf_results.csv", "w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(["alpha", "policy", "hit_ratio", "avg_latency", "p95_latency", "origin_load"])
+
+if __name__ == "__main__":
+    rows = []
+    param_list = []
 
     for a in alphas:
         for pol in policies:
             if pol == "NOCACHE":
-               metrics = run_sim(
-                n_contents=1000,
-                n_edges=4,
-                capacity=0,
-                alpha=a,
-                policy="LRU",
-                n_requests=200_000,
-                lat_edge_ms=10,
-                lat_origin_ms=100,
-                seed=42
-            ) 
+                params = dict(
+                    n_contents=1000,
+                    n_edges=4,
+                    capacity=0,
+                    alpha=a,
+                    policy="LRU",
+                    n_requests=200_000,
+                    lat_edge_ms=10,
+                    lat_origin_ms=100,
+                    seed=42
+                )
             else:
-                metrics = run_sim(
-                n_contents=1000,
-                n_edges=4,
-                capacity=100,
-                alpha=a,
-                policy=pol,
-                n_requests=200_000,
-                lat_edge_ms=10,
-                lat_origin_ms=100,
-                seed=42
-            )
+                params = dict(
+                    n_contents=1000,
+                    n_edges=4,
+                    capacity=100,
+                    alpha=a,
+                    policy=pol,
+                    n_requests=200_000,
+                    lat_edge_ms=10,
+                    lat_origin_ms=100,
+                    seed=42
+                )
+
+            rows.append((a, pol))
+            param_list.append(params)
+
+    results = run_sim_grid(param_list)
+
+    with open("results/zipf_results.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["alpha", "policy", "hit_ratio", "avg_latency", "p95_latency", "origin_load"])
 
+        for (a, pol), metrics in zip(rows, results):
             writer.writerow([
                 a,
                 pol,
@@ -44,4 +56,4 @@ with open("results/zipf_results.csv", "w", newline="") as f:
                 metrics["origin_load"]
             ])
 
-print("Zipf experiment complete!")
+    print("Zipf experiment complete!")
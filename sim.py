@@ -1,64 +1,87 @@
-import random
-import bisect
-from collections import OrderedDict
+import heapq
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict, deque
+from functools import lru_cache
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
+from typing import Deque, Dict, List, Set, Tuple, Optional, Union
+
+import numpy as np
 
 
 # -----------------------------
 # Zipf distribution utilities
 # -----------------------------
 
-def build_zipf_cdf(n_contents: int, alpha: float) -> Tuple[List[int], List[float]]:
+# Content id arrays [1..n] by catalogue size, shared by every alpha (read-only)
+_CONTENTS_CACHE: Dict[int, np.ndarray] = {}
+
+
+def _contents_array(n_contents: int) -> np.ndarray:
+    contents = _CONTENTS_CACHE.get(n_contents)
+    if contents is None:
+        contents = np.arange(1, n_contents + 1)
+        contents.setflags(write=False)
+        _CONTENTS_CACHE[n_contents] = contents
+    return contents
+
+
+@lru_cache(maxsize=None)
+def build_zipf_cdf(n_contents: int, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
     """
     Build CDF for a Zipf(alpha) distribution over content ids 1..n_contents.
+    Results are cached per (n_contents, alpha) and shared between calls, so the
+    returned arrays are read-only.
     Returns:
-        contents: [1, 2, ..., n_contents] -- A list of video IDs
-        cdf: cumulative probabilities (same length) -- The cumulative distribution function for the Zipf probabilities
+        contents: [1, 2, ..., n_contents] -- An array of video IDs
+        cdf: cumulative probabilities (same length, float64) -- The cumulative distribution function for the Zipf probabilities
     """
-    weights = [1.0 / (i ** alpha) for i in range(1, n_contents + 1)] # weights reflect popularity but do NOT sum to 1 yet. 
-                                                                     # The i-th most popular item gets ~1/i^α of the total traffic.
-    total = sum(weights) # Normalize weights into probabilities. We divide each weight by the sum so that all probabilities add up to 1.
-    probs = [w / total for w in weights]
-
-    cdf = [] # It transforms probabilities into “rolling sums.” or sum of probs up to i. Example: probs  = [0.50, 0.25, 0.15, 0.10]
-                                                                                                # cdf    = [0.50, 0.75, 0.90, 1.00]
-                                                                                                # cumulative mapping from probabilities → ranges in [0,1]
-    cumulative = 0.0
-    for p in probs:
-        cumulative += p
-        cdf.append(cumulative)
-
-    contents = list(range(1, n_contents + 1))
+    contents = _contents_array(n_contents)
+    cdf = np.power(contents, -alpha, dtype=np.float64) # weights reflect popularity but do NOT sum to 1 yet.
+                                                       # The i-th most popular item gets ~1/i^α of the total traffic.
+    cdf = cdf.cumsum() # It transforms weights into “rolling sums.” Example: weights = [0.50, 0.25, 0.15, 0.10]
+                       #                                                    cdf     = [0.50, 0.75, 0.90, 1.00]
+    cdf /= cdf[-1]     # Normalize in place so the last entry is exactly 1.0 (no separate probs array needed)
+                       # cumulative mapping from probabilities → ranges in [0,1]
+    cdf.setflags(write=False)
     return contents, cdf
 
 
-def sample_zipf(contents: List[int], cdf: List[float]) -> int:
-    """
-    Sample one content id from the Zipf CDF.
-    """
-    u = random.random() # random floating number [0.0 to 1.0)
-    idx = bisect.bisect_left(cdf, u) # find u >= cdf
-    return contents[idx]
-
-
 # -----------------------------
 # Edge cache implementation
 # -----------------------------
 
+# How many random eviction slots to draw from the generator at a time
+_EVICT_BATCH = 4096
+
+
 @dataclass
-class EdgeCache:
+class EdgeCache(ABC):
+    """
+    Shared request/miss handling for one edge cache. The policy itself lives in
+    the subclasses below, each of which overrides the three policy helpers without
+    re-checking the policy on every call. EdgeCache(capacity, policy, rng) builds
+    the subclass for the given policy.
+    """
     capacity: int
     policy: str  # "LRU", "LFU", "Random", "FIFO"
+    # Source of randomness for random eviction
+    rng: np.random.Generator = field(default_factory=np.random.default_rng, repr=False)
 
     # Internal state
-    cache: set = field(default_factory=set, init=False)
-    # For LRU: key order represents recency (rightmost is most recent)
-    lru_order: "OrderedDict[int, None]" = field(default_factory=OrderedDict, init=False)
-    # For LFU: frequency counts for each content in cache
-    freq: Dict[int, int] = field(default_factory=dict, init=False)
     # Simple access counter for tie breaking in LFU (optional)
     access_counter: int = field(default=0, init=False)
+    # The container that holds exactly the cached ids for this policy, used for
+    # membership tests and the current cache size (set by each subclass)
+    _index: Union[dict, set] = field(default_factory=dict, init=False, repr=False)
+
+    def __new__(cls, *args, **kwargs):
+        if cls is EdgeCache:
+            # Dispatch on the policy (second field) to its specialized subclass;
+            # unknown policies fall back to random eviction
+            policy = kwargs["policy"] if "policy" in kwargs else args[1]
+            cls = _CACHE_CLASSES.get(policy.upper(), _EdgeCacheRandom)
+        return super().__new__(cls)
 
     def request(self, content_id: int, lat_edge: float, lat_origin: float) -> Tuple[bool, float]:
         """
@@ -68,7 +91,7 @@ class EdgeCache:
         """
         self.access_counter += 1
 
-        if content_id in self.cache:
+        if content_id in self._index:
             # Cache hit
             self._update_on_hit(content_id)
             return True, lat_edge
@@ -81,24 +104,12 @@ class EdgeCache:
     # Policy helpers
     # -----------------------------
 
-    def _update_on_hit(self, content_id: int) -> None:
-        if self.policy.upper() == "LRU":
-            # Move to most recent
-            if content_id in self.lru_order:
-                self.lru_order.move_to_end(content_id, last=True)
-        elif self.policy.upper() == "LFU":
-            # Increase frequency count
-            self.freq[content_id] = self.freq.get(content_id, 0) + 1
-        else:
-            # Random and FIFO policies have no state to update on hit
-            pass
-
     def _insert_on_miss(self, content_id: int) -> None:
         if self.capacity <= 0:
             # No caching
             return
 
-        if len(self.cache) < self.capacity:
+        if len(self._index) < self.capacity:
             # There is space, just insert
             self._add_new_content(content_id)
         else:
@@ -106,65 +117,158 @@ class EdgeCache:
             self._evict_one()
             self._add_new_content(content_id)
 
+    @abstractmethod
+    def _update_on_hit(self, content_id: int) -> None:
+        ...
+
+    @abstractmethod
     def _add_new_content(self, content_id: int) -> None:
-        self.cache.add(content_id)
-
-        if self.policy.upper() in {"LRU", "FIFO"}:
-            self.lru_order[content_id] = None
-            self.lru_order.move_to_end(content_id, last=True)
-        elif self.policy.upper() == "LFU":
-            # New content starts with frequency 1
-            self.freq[content_id] = 1
-        elif self.policy.upper() == "RANDOM":
-            # No extra metadata needed
-            pass
+        ...
 
+    @abstractmethod
     def _evict_one(self) -> None:
-        if not self.cache:
-            return
+        ...
 
-        policy = self.policy.upper()
-
-        if policy in {"LRU", "FIFO"}:
-            # Evict least recently used (leftmost)
-            victim, _ = self.lru_order.popitem(last=False)
-            self.cache.remove(victim)
-            # Also clean freq if it exists
-            self.freq.pop(victim, None)
-
-        elif policy == "LFU":
-            # Evict least frequently used
-            # Simple O(C) scan is fine for our project sizes
-            victim = None
-            victim_freq = None
-
-            for cid in self.cache:
-                f = self.freq.get(cid, 0)
-                if victim is None or f < victim_freq:
-                    victim = cid
-                    victim_freq = f
-
-            if victim is not None:
-                self.cache.remove(victim)
-                self.freq.pop(victim, None)
-                # Also remove from LRU order if present (optional)
-                if victim in self.lru_order:
-                    self.lru_order.pop(victim)
-
-        elif policy == "RANDOM":
-            # Evict random item from cache
-            victim = random.choice(tuple(self.cache))
-            self.cache.remove(victim)
-            self.freq.pop(victim, None)
-            if victim in self.lru_order:
-                self.lru_order.pop(victim)
-        else:
-            # Fallback to random if unknown policy
-            victim = random.choice(tuple(self.cache))
-            self.cache.remove(victim)
-            self.freq.pop(victim, None)
-            if victim in self.lru_order:
-                self.lru_order.pop(victim)
+
+@dataclass
+class _EdgeCacheLRU(EdgeCache):
+    # Key order represents recency (rightmost is most recent)
+    # Kept as an OrderedDict on purpose: a plain dict preserves order too, but evicting
+    # with next(iter(d)) has to skip the deleted slots piling up at the front until the
+    # next resize, which measured slower than popitem(last=False) from C≈100 upwards
+    lru_order: "OrderedDict[int, None]" = field(default_factory=OrderedDict, init=False)
+
+    def __post_init__(self) -> None:
+        self._index = self.lru_order
+
+    def _update_on_hit(self, content_id: int) -> None:
+        # Move to most recent (request() already confirmed content_id is cached)
+        self.lru_order.move_to_end(content_id)
+
+    def _add_new_content(self, content_id: int) -> None:
+        # Append as most recent (content_id is never already present here,
+        # so no move_to_end is needed)
+        self.lru_order[content_id] = None
+
+    def _evict_one(self) -> None:
+        # Evict least recently used (leftmost)
+        self.lru_order.popitem(last=False)
+
+
+@dataclass
+class _EdgeCacheFIFO(EdgeCache):
+    # Insertion order (leftmost is oldest) plus the set of cached ids
+    _fifo: Deque[int] = field(default_factory=deque, init=False, repr=False)
+    _fifo_members: Set[int] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._index = self._fifo_members
+
+    def _update_on_hit(self, content_id: int) -> None:
+        # FIFO has no state to update on hit
+        pass
+
+    def _add_new_content(self, content_id: int) -> None:
+        self._fifo.append(content_id)
+        self._fifo_members.add(content_id)
+
+    def _evict_one(self) -> None:
+        # Evict the oldest insertion (leftmost)
+        self._fifo_members.remove(self._fifo.popleft())
+
+
+@dataclass
+class _EdgeCacheLFU(EdgeCache):
+    # Frequency counts for each content in cache
+    freq: Dict[int, int] = field(default_factory=dict, init=False)
+    # Min-heap of (freq, access_counter, content_id). Entries are never removed
+    # on a hit, a fresh one is pushed instead; an entry is stale once its freq no longer
+    # matches self.freq, and stale entries are skipped when popping (lazy deletion)
+    _lfu_heap: list = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._index = self.freq
+
+    def _update_on_hit(self, content_id: int) -> None:
+        # Increase frequency count
+        f = self.freq.get(content_id, 0) + 1
+        self.freq[content_id] = f
+        self._push_lfu(f, content_id)
+
+    def _add_new_content(self, content_id: int) -> None:
+        # New content starts with frequency 1
+        self.freq[content_id] = 1
+        self._push_lfu(1, content_id)
+
+    def _evict_one(self) -> None:
+        # Evict least frequently used (ties: least recently counted)
+        # Pop until the top entry is still current, O(log C) amortized
+        heap = self._lfu_heap
+        while heap:
+            f, _, cid = heapq.heappop(heap)
+            if self.freq.get(cid) == f:
+                del self.freq[cid]
+                return
+
+    def _push_lfu(self, f: int, content_id: int) -> None:
+        heap = self._lfu_heap
+        heapq.heappush(heap, (f, self.access_counter, content_id))
+
+        # Every hit leaves a stale entry behind; drop them once they outnumber the
+        # live ones so the heap stays O(C) instead of growing with the request count
+        if len(heap) > 4 * max(self.capacity, 1):
+            freq = self.freq
+            heap[:] = [e for e in heap if freq.get(e[2]) == e[0]]
+            heapq.heapify(heap)
+
+
+@dataclass
+class _EdgeCacheRandom(EdgeCache):
+    # Cached ids in a flat list plus each id's position in it, so a random
+    # victim can be picked and swap-removed in O(1)
+    _slots: List[int] = field(default_factory=list, init=False, repr=False)
+    _slot_idx: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    # Pre-drawn eviction slots in [0, capacity), consumed from the end
+    _evict_draws: List[int] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._index = self._slot_idx
+
+    def _update_on_hit(self, content_id: int) -> None:
+        # Random has no state to update on hit
+        pass
+
+    def _add_new_content(self, content_id: int) -> None:
+        # Remember which slot the new id lives in
+        self._slot_idx[content_id] = len(self._slots)
+        self._slots.append(content_id)
+
+    def _evict_one(self) -> None:
+        # Eviction only happens when the cache is full, so a slot drawn from
+        # [0, capacity) always lands on a cached item
+        if not self._evict_draws:
+            self._evict_draws = self.rng.integers(0, self.capacity, _EVICT_BATCH).tolist()
+        i = self._evict_draws.pop()
+        slots = self._slots
+        victim = slots[i]
+
+        # Swap-remove: move the last id into the freed slot
+        last = slots.pop()
+        if i != len(slots):
+            slots[i] = last
+            self._slot_idx[last] = i
+        del self._slot_idx[victim]
+
+
+# Policy name -> specialized cache class. NOCACHE runs with capacity 0 and never
+# reaches a policy helper; unknown policies fall back to random eviction.
+_CACHE_CLASSES = {
+    "LRU": _EdgeCacheLRU,
+    "LFU": _EdgeCacheLFU,
+    "FIFO": _EdgeCacheFIFO,
+    "RANDOM": _EdgeCacheRandom,
+    "NOCACHE": _EdgeCacheRandom,
+}
 
 
 # -----------------------------
@@ -192,44 +296,62 @@ def run_sim(
         "p95_latency_ms"
         "origin_load" (number of origin fetches)
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = np.random.default_rng(seed) # single source of randomness for the whole run
 
     # Build Zipf CDF
-    contents, cdf = build_zipf_cdf(n_contents, alpha)
+    _, cdf = build_zipf_cdf(n_contents, alpha) # content ids come straight from the CDF index below
+
+    # Precompute the whole request stream in one go: which content, and which edge gets it
+    u = rng.random(n_requests) # random floating numbers [0.0 to 1.0)
+    content_stream = np.searchsorted(cdf, u) + 1 # inverse transform sampling; contents are 1..n_contents
+    edge_stream = rng.integers(0, n_edges, n_requests)
 
     # Initialize edge caches
-    edges = [EdgeCache(capacity=capacity, policy=policy) for _ in range(n_edges)]
+    # (the policy is resolved once here, so the per-request path never branches on it)
+    edges = [EdgeCache(capacity=capacity, policy=policy, rng=rng) for _ in range(n_edges)]
+
+    # Edges never share state, so each one only needs its own slice of the stream,
+    # in the original order. A stable sort by edge index lays the slices out back to
+    # back, and each edge then runs through its slice in one contiguous batch.
+    order = np.argsort(edge_stream, kind="stable")
+    bounds = np.cumsum(np.bincount(edge_stream, minlength=n_edges))[:-1]
+    edge_streams = np.split(content_stream[order], bounds)
 
     total_hits = 0
-    total_misses = 0
-    latencies: List[float] = []
 
-    for _ in range(n_requests):
-        edge_idx = random.randrange(n_edges)
-        edge = edges[edge_idx]
+    for edge, stream in zip(edges, edge_streams):
+        # Bind the method once per edge instead of looking it up on every request
+        request = edge.request
 
-        content_id = sample_zipf(contents, cdf)
-        hit, latency = edge.request(content_id, lat_edge_ms, lat_origin_ms)
+        # Iterate over plain Python ints: indexing a NumPy array element by element
+        # boxes a new NumPy scalar on every access, which dominates a loop this tight
+        for content_id in stream.tolist():
+            hit, _ = request(content_id, lat_edge_ms, lat_origin_ms)
+            if hit:
+                total_hits += 1
 
-        latencies.append(latency)
-        if hit:
-            total_hits += 1
-        else:
-            total_misses += 1
+    total_misses = n_requests - total_hits
 
     # Compute metrics
+    # Every request costs either lat_edge_ms (hit) or lat_origin_ms (miss), so the
+    # latency distribution is fully described by the hit/miss counts: no need to
+    # keep one latency per request around.
     total = max(n_requests, 1)
     hit_ratio = total_hits / total
     miss_ratio = total_misses / total
-    avg_latency = sum(latencies) / len(latencies) if latencies else 0.0
-
-    # 95th percentile
-    if latencies:
-        sorted_lat = sorted(latencies)
-        idx = int(0.95 * len(sorted_lat)) - 1
-        idx = max(0, min(idx, len(sorted_lat) - 1))
-        p95_latency = sorted_lat[idx]
+    if n_requests:
+        avg_latency = (total_hits * lat_edge_ms + total_misses * lat_origin_ms) / n_requests
+    else:
+        avg_latency = 0.0
+
+    # 95th percentile: same index into the sorted latencies as before, where the
+    # sorted list is just n_fast copies of the low latency followed by the high one
+    if n_requests:
+        idx = int(0.95 * n_requests) - 1
+        idx = max(0, min(idx, n_requests - 1))
+        fast, slow = sorted((lat_edge_ms, lat_origin_ms))
+        n_fast = total_hits if lat_edge_ms <= lat_origin_ms else total_misses
+        p95_latency = fast if idx < n_fast else slow
     else:
         p95_latency = 0.0
 
@@ -243,6 +365,23 @@ def run_sim(
     return metrics
 
 
+def run_sim_kwargs(params: Dict) -> Dict[str, float]:
+    """
+    run_sim taking its arguments as a single dict, so it can be mapped over a pool.
+    """
+    return run_sim(**params)
+
+
+def run_sim_grid(param_list: List[Dict]) -> List[Dict[str, float]]:
+    """
+    Run run_sim once per parameter dict and return the metrics in the same order.
+    """
+    # Every run is independent, so farm the whole grid out to one worker process per core.
+    # chunksize=1: each job is a long simulation, so there is nothing to batch
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(run_sim_kwargs, param_list, chunksize=1))
+
+
 # -----------------------------
 # Example usage
 # -----------------------------